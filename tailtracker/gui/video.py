@@ -1,13 +1,80 @@
 from .widget import TailInitializationWidget
 from PyQt5 import QtWidgets, QtCore
 from video_analysis_toolbox.video import Video
+import cv2
+import numpy as np
+import os
+
+
+class FrameDecoder(QtCore.QObject):
+    """Decodes video frames on a worker thread.
+
+    Lives on its own QThread so that seeking and decoding never block the GUI thread; decoded frames are delivered
+    back to the widget via the `frameReady` signal (a queued connection across threads).
+    """
+
+    frameReady = QtCore.pyqtSignal(object)
+
+    # Maximum number of frames to skip over with grab() before falling back to a full seek
+    SEQUENTIAL_GRAB_LIMIT = 16
+
+    def __init__(self, video: Video, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.video = video
+        self._last_frame_idx = -1
+        # Pinned scratch buffers reused across decodes; only the copy emitted to the GUI is allocated per frame
+        self._frame_buf = None
+        self._gray_buf = None
+        self._configure_threading()
+
+    def _configure_threading(self):
+        """Enables the decode backend's internal (FFmpeg slice/frame) threading where the video object exposes it."""
+        cap = getattr(self.video, "cap", None)
+        if cap is not None and hasattr(cv2, "CAP_PROP_N_THREADS"):
+            cap.set(cv2.CAP_PROP_N_THREADS, os.cpu_count())
+        container = getattr(self.video, "container", None)  # PyAV-backed videos
+        if container is not None:
+            try:
+                container.streams.video[0].thread_type = "AUTO"
+            except (AttributeError, IndexError):
+                pass
+
+    def _decode_frame(self, val):
+        """Decodes the requested frame, using grab()/retrieve() to skip over intermediate frames when scrubbing
+        forwards. grab() advances the decoder without the (expensive) frame reconstruction, so only the frame that is
+        actually displayed pays for a full decode; backward seeks and long jumps fall back to a regular seek."""
+        cap = getattr(self.video, "cap", None)
+        step = val - self._last_frame_idx
+        if cap is not None and 0 < step <= self.SEQUENTIAL_GRAB_LIMIT:
+            for _ in range(step):
+                cap.grab()
+            ret, frame = cap.retrieve(self._frame_buf)
+            if ret:
+                self._frame_buf = frame  # retrieve decodes into this buffer on subsequent calls
+                if frame.ndim == 3:
+                    if self._gray_buf is None:
+                        self._gray_buf = np.empty(frame.shape[:2], dtype=frame.dtype)
+                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+                return frame
+        return self.video.grab_frame(val)
+
+    @QtCore.pyqtSlot(int)
+    def decode(self, val):
+        frame = self._decode_frame(val)
+        self._last_frame_idx = val
+        # Emit a copy: the scratch buffers are only safe inside this thread, and the next decode would overwrite
+        # the frame in place while the GUI thread is still reading it
+        self.frameReady.emit(frame.copy())
 
 
 class TailTrackerVideoWidget(TailInitializationWidget):
 
+    frameRequested = QtCore.pyqtSignal(int)
+
     def __init__(self, video: Video, *args, **kwargs):
         self.video = video
         super().__init__()
+        self._init_decoder()
         self.frame_slider.setValue(0)
         self.change_frame(0)
 
@@ -15,14 +82,40 @@ class TailTrackerVideoWidget(TailInitializationWidget):
         super()._init_ui()
         self._add_frame_slider()
 
+    def _init_decoder(self):
+        self.decoder = FrameDecoder(self.video)
+        self._decoder_thread = QtCore.QThread()
+        self.decoder.moveToThread(self._decoder_thread)
+        self.frameRequested.connect(self.decoder.decode)
+        self.decoder.frameReady.connect(self.new_image)
+        self._decoder_thread.start()
+
     def _add_frame_slider(self):
         self.frame_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
         self.frame_slider.setMinimum(0)
         self.frame_slider.setMaximum(self.video.frame_count - 1)
         self.layout().addWidget(self.frame_slider, 2, 0, 1, 1)
-        self.frame_slider.valueChanged.connect(self.change_frame)
+        # Throttle slider events: dragging emits dozens of valueChanged signals per second, but only the most recent
+        # frame needs to be decoded. The single-shot timer restarts on every tick and fires after a short quiet period.
+        self._pending_frame = None
+        self._frame_timer = QtCore.QTimer(singleShot=True, interval=30)
+        self._frame_timer.timeout.connect(self._apply_pending_frame)
+        self.frame_slider.valueChanged.connect(self._queue_frame)
+
+    @QtCore.pyqtSlot(int)
+    def _queue_frame(self, val):
+        self._pending_frame = val
+        self._frame_timer.start()
+
+    @QtCore.pyqtSlot()
+    def _apply_pending_frame(self):
+        self.change_frame(self._pending_frame)
 
     @QtCore.pyqtSlot(int)
     def change_frame(self, val):
-        frame = self.video.grab_frame(val)
-        self.new_image(frame)
+        self.frameRequested.emit(val)
+
+    def closeEvent(self, event):
+        self._decoder_thread.quit()
+        self._decoder_thread.wait()
+        super().closeEvent(event)
@@ -1,8 +1,9 @@
 from ..tracker import TailTracker
 from PyQt5 import QtWidgets, QtCore
 from .collapsible_widget import QCollapsibleWidget
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+import pyqtgraph as pg
+import cv2
+import numpy as np
 from collections import namedtuple
 import sys
 
@@ -26,6 +27,8 @@ class TailInitializationWidget(QtWidgets.QWidget):
         super().__init__(*args, **kwargs)
         # Create a tracker object
         self.tracker = TailTracker(None, None, 10)
+        # Number of points placed so far (0, 1 or 2); drives the hint text, accept button and tracking overlay
+        self._n_points_placed = 0
         # Initialize user interface
         self._init_ui()
         # Image
@@ -45,7 +48,6 @@ class TailInitializationWidget(QtWidgets.QWidget):
         self.setLayout(QtWidgets.QGridLayout())
         self._init_canvas()
         self._init_params()
-        self._init_states()
         self._init_connections()
 
     def _init_canvas(self):
@@ -57,15 +59,18 @@ class TailInitializationWidget(QtWidgets.QWidget):
         ]
         self.hint_label = QtWidgets.QLabel(self.hints[0])
         self.layout().addWidget(self.hint_label, 0, 0, 1, 2)
-        # Create canvas widget and figure
-        self.figure = Figure()
-        self.canvas_widget = FigureCanvas(self.figure)
+        # Create pyqtgraph canvas (renders directly through Qt's graphics view, far faster than an Agg canvas)
+        self.canvas_widget = pg.GraphicsLayoutWidget()
         self.layout().addWidget(self.canvas_widget, 1, 0)
-        # Create axis for plotting
-        self.ax = self.figure.add_subplot(111)
-        self.ax.axis('off')
-        self.path, = self.ax.plot([], [], 'o-', color='y', lw=3)
-        self.tracked, = self.ax.plot([], [], 'o', color='c', lw=3)
+        # Create view box for plotting, with the image coordinate convention (origin top left, y down)
+        self.view = self.canvas_widget.addViewBox(lockAspect=True, invertY=True)
+        self.view.setMenuEnabled(False)
+        self.image_data = pg.ImageItem(axisOrder='row-major')
+        self.view.addItem(self.image_data)
+        self.path = pg.PlotDataItem([], [], pen=pg.mkPen('y', width=3), symbol='o', symbolBrush='y')
+        self.tracked = pg.PlotDataItem([], [], pen=None, symbol='o', symbolBrush='c')
+        self.view.addItem(self.path)
+        self.view.addItem(self.tracked)
 
     def _init_params(self):
         self.params_widget = QtWidgets.QWidget()
@@ -129,33 +134,13 @@ class TailInitializationWidget(QtWidgets.QWidget):
         self.params_widget.layout().addWidget(self.accept_button)
         self.params_widget.layout().addWidget(self.cancel_button)
 
-    def _init_states(self):
-        # Create state machine
-        self.state_machine = QtCore.QStateMachine()
-        # Create states
-        self.s0 = QtCore.QState()  # no points
-        self.s1 = QtCore.QState()  # one point
-        self.s2 = QtCore.QState()  # two points
-        self.states = (self.s0, self.s1, self.s2)
-        # Set transitions
-        self.s0.addTransition(self.pointAdded, self.s1)
-        self.s1.addTransition(self.pointAdded, self.s2)
-        self.s1.addTransition(self.pointsErased, self.s0)
-        self.s2.addTransition(self.pointsErased, self.s0)
-        # Start state machine
-        self.state_machine.addState(self.s0)
-        self.state_machine.addState(self.s1)
-        self.state_machine.addState(self.s2)
-        self.state_machine.setInitialState(self.s0)
-        self.state_machine.start()
-
     def _init_connections(self):
         # Button clicks
         self.new_button.clicked.connect(self.changeImage)
         self.accept_button.clicked.connect(self.accept)
         self.cancel_button.clicked.connect(self.reject)
         # Handle mouse click events
-        self.canvas_widget.mpl_connect('button_press_event', self.mouse_button_pressed)
+        self.canvas_widget.scene().sigMouseClicked.connect(self.mouse_button_pressed)
         # Change diagnostic image
         self.image_combo.currentIndexChanged.connect(self.change_displayed_image)
         # Toggle tracking
@@ -164,23 +149,20 @@ class TailInitializationWidget(QtWidgets.QWidget):
         self.n_points_spinbox.valueChanged.connect(self.update_tracker_params)
         self.ksize_spinbix.valueChanged.connect(self.update_tracker_params)
         self.background_combo.currentIndexChanged.connect(self.update_tracker_params)
-        # State changes
-        self.s0.entered.connect(lambda: self.accept_button.setEnabled(False))
-        self.s2.entered.connect(lambda: self.accept_button.setEnabled(True))
-        self.s0.entered.connect(lambda : self.hint_label.setText(self.hints[0]))
-        self.s1.entered.connect(lambda: self.hint_label.setText(self.hints[1]))
-        self.s2.entered.connect(lambda: self.hint_label.setText(self.hints[2]))
-        self.s2.entered.connect(self.initialize_tracker)
-        self.s0.entered.connect(self.update_tracking)
         # Set retval
         self.accept.connect(lambda: self.set_retval(True))
         self.reject.connect(lambda: self.set_retval(False))
 
-    @property
-    def current_state(self):
-        for s in self.states:
-            if s in self.state_machine.configuration():
-                return s
+    def _on_state_changed(self):
+        """Updates the hint text, accept button and tracking overlay after the number of placed points changes.
+        Dispatches inline instead of routing through a state machine and the Qt event loop."""
+        n = self._n_points_placed
+        self.hint_label.setText(self.hints[n])
+        self.accept_button.setEnabled(n == 2)
+        if n == 2:
+            self.initialize_tracker()
+        elif n == 0:
+            self.update_tracking()
 
     @property
     def n_points(self):
@@ -195,12 +177,16 @@ class TailInitializationWidget(QtWidgets.QWidget):
         return self.ksize_spinbix.value()
 
     def mouse_button_pressed(self, event):
-        if (not event.inaxes) or (self.image is None):
+        if self.image is None:
+            return
+        pos = self.view.mapSceneToView(event.scenePos())
+        x, y = int(pos.x()), int(pos.y())
+        height, width = self.image.shape[:2]
+        if not (0 <= x < width and 0 <= y < height):
             return
-        elif event.button == 1:  # left mouse button
-            x, y = int(event.xdata), int(event.ydata)
+        if event.button() == QtCore.Qt.LeftButton:
             self.new_point(x, y)
-        elif event.button == 3:  # right mouse button
+        elif event.button() == QtCore.Qt.RightButton:
             self.erase()
 
     def new_image(self, image):
@@ -211,39 +197,41 @@ class TailInitializationWidget(QtWidgets.QWidget):
     def new_point(self, x, y):
         if len(self.points) < 2:
             self.points.append((x, y))
-        self.update_point_data()
+            self._n_points_placed = len(self.points)
+            self.update_point_data()
+            self._on_state_changed()
         self.pointAdded.emit(x, y)
 
     def erase(self):
         self.points = []
+        self._n_points_placed = 0
         self.update_point_data()
+        self._on_state_changed()
         self.pointsErased.emit()
 
     def update_image_data(self):
         img = self.get_display_image()
         if img is not None:
-            img = img / img.max()
-            try:
-                self.image_data.set_data(img)
-            except AttributeError:
-                self.image_data = self.ax.imshow(img, origin='upper', cmap='Greys_r')
-        self.draw()
+            if img.dtype != np.uint8:
+                # Rescale to uint8 in a single SIMD pass instead of allocating a float64 normalized copy
+                img = cv2.convertScaleAbs(img, alpha=255.0 / max(float(img.max()), 1e-12))
+            # Fixed levels skip per-frame auto-normalization in the image item
+            self.image_data.setImage(img, autoLevels=False, levels=(0, 255))
 
     def update_point_data(self):
-        x = [p[0] for p in self.points]
-        y = [p[1] for p in self.points]
-        self.path.set_data(x, y)
-        self.draw()
+        if self.points:
+            points = np.asarray(self.points)
+            self.path.setData(points[:, 0], points[:, 1])
+        else:
+            self.path.setData([], [])
 
     def update_tracking(self):
-        if self.tracking_checkbox.checkState() and (self.current_state is self.s2):
+        if self.tracking_checkbox.checkState() and (self._n_points_placed == 2):
             self.tracker.track(self.image)
-            x = [p[0] for p in self.tracker.points]
-            y = [p[1] for p in self.tracker.points]
-            self.tracked.set_data(x, y)
+            points = self.tracker.points_array
+            self.tracked.setData(points[:, 0], points[:, 1])
         else:
-            self.tracked.set_data([], [])
-        self.draw()
+            self.tracked.setData([], [])
 
     @QtCore.pyqtSlot(int)
     def update_tracker_params(self, val):
@@ -264,7 +252,7 @@ class TailInitializationWidget(QtWidgets.QWidget):
 
     def get_diagnostic_image(self):
         if self.image is not None:
-            return self.tracker.preprocess(self.image)
+            return self.tracker.preprocess_for_display(self.image)
 
     @QtCore.pyqtSlot(int)
     def change_displayed_image(self, idx):
@@ -272,7 +260,9 @@ class TailInitializationWidget(QtWidgets.QWidget):
         self.update_image_data()
 
     def draw(self):
-        self.canvas_widget.draw()
+        """No-op retained for API compatibility: pyqtgraph items schedule their own repaints when their data is set,
+        and Qt coalesces those paint events."""
+        pass
 
     def set_retval(self, val):
         self.ret = val
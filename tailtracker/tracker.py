@@ -1,7 +1,77 @@
 import cv2
 import numpy as np
+from numba import njit
 from typing import Tuple, Optional
 
+# Number of samples along each 180 degree arc. A power of two keeps the inner argmin loop aligned to SIMD lane widths
+# (16 int16 LUT offsets fit a single 256-bit vector load).
+N_ARC_SAMPLES = 16
+
+
+@njit(cache=True, fastmath=True)
+def _walk(img, x0, y0, start_angle, arc_offsets, dx_lut, dy_lut, n_points, ksize, minmax_sign, points):
+    """Walk along the tail, writing tail points into the preallocated (n_points + 1, 2) integer array `points`.
+
+    At each step the darkest (`minmax_sign` = 1) or brightest (`minmax_sign` = -1) box-filtered pixel is found along a
+    180 degree arc centred on the current angle. The filter response is evaluated directly from the raw image as a
+    (ksize x ksize) neighborhood sum at each arc sample, so only the pixels actually visited pay for filtering rather
+    than the whole frame. The arc pixel offsets come from `dx_lut`/`dy_lut`, precomputed per quantized center angle
+    (one row per angle bin over the full circle), so each step costs one LUT row load plus integer adds instead of
+    trig. Sample and neighborhood coordinates are clamped to the image bounds (replicated border), so tails that
+    approach the image border stick to the edge pixels instead of raising.
+    """
+    height, width = img.shape
+    n_arc = len(arc_offsets)
+    n_bins = dx_lut.shape[0]
+    k2 = ksize // 2
+    points[0, 0] = x0
+    points[0, 1] = y0
+    x, y = x0, y0
+    center_angle = start_angle
+    for j in range(n_points):
+        # Quantize the center angle to the nearest LUT bin (bitmask handles wrapping beyond +/- pi)
+        b = int(round((center_angle + np.pi) * n_bins / (2 * np.pi))) & (n_bins - 1)
+        best_val = 1e300
+        best_idx = 0
+        best_x, best_y = x, y
+        for k in range(n_arc):
+            xi = x + dx_lut[b, k]
+            yi = y + dy_lut[b, k]
+            # Clamp to the image bounds (branchless via cmov for in-bounds samples)
+            if xi < 0:
+                xi = 0
+            elif xi >= width:
+                xi = width - 1
+            if yi < 0:
+                yi = 0
+            elif yi >= height:
+                yi = height - 1
+            # Box-filter response at the sample: neighborhood sum (the mean's constant divisor cannot change the
+            # argmin/argmax, so the division is skipped)
+            val = 0.0
+            for dy in range(-k2, k2 + 1):
+                yy = yi + dy
+                if yy < 0:
+                    yy = 0
+                elif yy >= height:
+                    yy = height - 1
+                for dx in range(-k2, k2 + 1):
+                    xx = xi + dx
+                    if xx < 0:
+                        xx = 0
+                    elif xx >= width:
+                        xx = width - 1
+                    val += img[yy, xx]
+            val *= minmax_sign
+            if val < best_val:
+                best_val = val
+                best_idx = k
+                best_x, best_y = xi, yi
+        x, y = best_x, best_y
+        center_angle = center_angle + arc_offsets[best_idx]
+        points[j + 1, 0] = x
+        points[j + 1, 1] = y
+
 
 class TailTracker:
     """Class for head-embedded tail tracking.
@@ -38,9 +108,9 @@ class TailTracker:
     _filtered : np.ndarray
         Image after applying a box filter.
     points : list
-        List of tail points.
+        List of tail points (derived from `points_array` on access).
     points_array : np.ndarray
-        Tail points converted to a numpy array.
+        Preallocated (n_points + 1, 2) array of tail points that the tracking kernel writes into.
     tail_angle : float
         The angle of the tail in the image. Angles increase counterclockwise starting from the right.
 
@@ -49,7 +119,9 @@ class TailTracker:
     After initializing an instance of the class, the `track` method may be called to track individual images. If
     `start_point`, `tail_length`, or `n_points` is None, the `track` method will similarly return None.
 
-    Images are first normalized and then a box filter of the specified kernel size is applied. The tracking algorithm
+    For tracking, the box filter of the specified kernel size is evaluated directly at the arc sample points inside
+    the walk kernel, so no full-frame filtering or normalization is performed; images are only normalized and filtered
+    whole in the display path used by the GUI (`preprocess_for_display`). The tracking algorithm
     finds the positions of either the darkest of brightest pixel within 180 degree arcs that propagate along the tail.
     These points are appended to the `_points` list until all points are found. The tail angle if then computed between
     the starting point and the average of the last n tip points.
@@ -91,9 +163,39 @@ class TailTracker:
         self._image = None
         self._normalized = None
         self._filtered = None
-        self.points = []
-        self.points_array = np.array([])
+        self.points_array = self._allocate_points()
         self.tail_angle = 0
+        # Precomputed arc table, shared across frames (avoids rebuilding linspace/cos/sin every step)
+        self._arc_offsets = np.linspace(-np.pi / 2, np.pi / 2, N_ARC_SAMPLES)
+        # Pixel-offset LUT over quantized center angles, built lazily per point spacing
+        self._n_angle_bins = 256
+        self._dx_lut = None
+        self._dy_lut = None
+        self._lut_spacing = None
+
+    def _build_arc_lut(self, spacing: float):
+        """Precomputes integer (dx, dy) arc sample offsets for each quantized center angle.
+
+        The walk kernel only ever evaluates the arc at a fixed spacing, so for each of `_n_angle_bins` bins over the
+        full circle the pixel offsets of all arc samples can be tabulated once and reused for every frame and step.
+        """
+        bins = np.linspace(-np.pi, np.pi, self._n_angle_bins, endpoint=False)
+        angles = bins[:, None] + self._arc_offsets[None, :]
+        self._dx_lut = np.round(spacing * np.cos(angles)).astype(np.int16)
+        self._dy_lut = np.round(-spacing * np.sin(angles)).astype(np.int16)
+        self._lut_spacing = spacing
+
+    def _allocate_points(self) -> np.ndarray:
+        """Allocates the (n_points + 1, 2) output array that the walk kernel writes tail points into. Zeroed so that
+        `points_array` never exposes uninitialized memory before the first `track` call."""
+        n = self.n_points if self.n_points is not None else -1
+        return np.zeros((n + 1, 2), dtype=np.int32)
+
+    @property
+    def points(self) -> list:
+        """Tail points as a list of [x, y] pairs. Derived from `points_array` on access; tracking itself only touches
+        the preallocated array."""
+        return self.points_array.tolist()
 
     @property
     def background(self) -> str:
@@ -101,12 +203,10 @@ class TailTracker:
 
     @background.setter
     def background(self, val: str):
-        """Setter for the background attribute. Changing the background also changes the private attribute containing
-        the function used to find tail points."""
+        """Setter for the background attribute. "light" backgrounds track the darkest pixels along each arc and "dark"
+        backgrounds the brightest, handled by a single sign flip passed to the walk kernel rather than separate
+        argmin/argmax functions."""
         self._background = val.lower()
-        self._minmax_function = np.argmin
-        if self._background == "dark":
-            self._minmax_function = np.argmax
 
     @staticmethod
     def compute_tail_angle(tail_points: np.ndarray, n_points=3, baseline=0.) -> float:
@@ -115,7 +215,8 @@ class TailTracker:
         Parameters
         ----------
         tail_points : np.ndarray
-            An array of tail points. May contain data from a single frame or multiple frames.
+            An array of tail points. May contain data from a single frame, shape (n, 2), or multiple frames, shape
+            (n_frames, n, 2).
         n_points : int, default=3
             The number of points that are averaged to compute the tail angle.
         baseline : float, default=0
@@ -123,25 +224,28 @@ class TailTracker:
 
         Returns
         -------
-        angle : float
+        angle : float or np.ndarray
+            A scalar for a single frame of points, or an (n_frames,) array for a batch.
 
         Notes
         -----
         Computes a tail vector between the first point in the array and the average position of the last n points. The
-        tail angle is the deflection angle of this vector from the given baseline.
+        tail angle is the deflection angle of this vector from the given baseline. All operations broadcast over any
+        leading frame axes, so a whole batch of frames is handled in a single call.
         """
         v0 = np.array([np.cos(baseline), np.sin(baseline)])
-        v1 = np.nanmean(tail_points[..., -n_points:, :], axis=0) - tail_points[..., 0, :]
-        x, y = v1 - v0
-        angle = np.arctan2(-y, x)
+        v1 = np.nanmean(tail_points[..., -n_points:, :], axis=-2) - tail_points[..., 0, :]
+        v = v1 - v0
+        angle = np.arctan2(-v[..., 1], v[..., 0])
         return angle
 
-    def preprocess(self, image):
+    def preprocess_for_display(self, image):
+        """Normalizes the image so that the maximum value is 1 before box-filtering. Only used for diagnostic display
+        in the GUI; tracking evaluates the box filter at the arc samples inside the walk kernel instead."""
         self._image = np.array(image).copy()  # copying the array prevents opencv from throwing weird errors
         # Normalize image and apply box filter
         self._normalized = self._image / np.max(self._image)
-        mask = np.zeros(self._normalized.shape)
-        self._filtered = cv2.boxFilter(self._normalized, -1, (self.ksize, self.ksize), mask)
+        self._filtered = cv2.blur(self._normalized, (self.ksize, self.ksize))
         return self._filtered
 
     def track(self, image: np.ndarray):
@@ -158,35 +262,63 @@ class TailTracker:
         # Return None is start_xy, tail_length or n_points is not specified
         if any([self.start_point is None, self.tail_length is None, self.n_points is None]):
             return
-        # Preprocess image
-        track_image = self.preprocess(image)
-        # Compute spacing between points
+        # No full-frame preprocessing: the walk kernel evaluates the box filter only at arc samples
+        track_image = np.ascontiguousarray(image)
+        # Compute spacing between points and rebuild the arc LUT if it changed
         spacing = float(self.tail_length) / self.n_points
-        # Create 180 degree arc
-        arc = np.linspace(-np.pi / 2, np.pi / 2, 20) + self.start_angle
-        # Initialize points list
+        if spacing != self._lut_spacing:
+            self._build_arc_lut(spacing)
+        # Walk along the tail in the compiled kernel, writing into the preallocated points array
+        if self.points_array.shape[0] != self.n_points + 1:
+            self.points_array = self._allocate_points()
         x, y = self.start_point
-        self.points = [[x, y]]
-        for j in range(self.n_points):
-            try:
-                # Find the x and y values of the arc centred around current x and y
-                xs = x + spacing * np.cos(arc)
-                ys = y - spacing * np.sin(arc)
-                # Convert them to integer, because of definite pixels
-                xs, ys = xs.astype(int), ys.astype(int)
-                # Find the index of the minimum or maximum pixel intensity along arc
-                idx = self._minmax_function(track_image[ys, xs])
-                # Update new x, y points
-                x = xs[idx]
-                y = ys[idx]
-                # Create a new 180 arc centered around current angle
-                arc = np.linspace(arc[idx] - np.pi / 2, arc[idx] + np.pi / 2, 20)
-                # Add point to list
-                self.points.append([x, y])
-            except IndexError:
-                self.points.append(self.points[-1])
-        # Create numpy array of tail points
-        self.points_array = np.array(self.points)
+        minmax_sign = -1 if self._background == "dark" else 1
+        _walk(track_image, x, y, float(self.start_angle),
+              self._arc_offsets, self._dx_lut, self._dy_lut, self.n_points, self.ksize, minmax_sign,
+              self.points_array)
         # Compute tail angle
         self.tail_angle = self.compute_tail_angle(self.points_array, self.n_tip_points, self.start_angle)
         return self.tail_angle
+
+    def track_batch(self, frames):
+        """Tracks a batch of frames, returning the tail angle for every frame.
+
+        Parameters
+        ----------
+        frames : sequence or iterable of np.ndarray
+            The images to track.
+
+        Returns
+        -------
+        angles : np.ndarray
+            An (n_frames,) array of tail angles (radians).
+
+        Notes
+        -----
+        The walk kernel still runs once per frame, but the points for all frames are stacked into a single
+        (n_frames, n_points + 1, 2) array and the tail angles are computed in one vectorized `compute_tail_angle`
+        call, instead of paying the per-call NumPy overhead for every frame. Frames are consumed one at a time, so a
+        generator that streams them from a video decoder keeps only the small per-frame point arrays in memory.
+        """
+        # Return None is start_xy, tail_length or n_points is not specified
+        if any([self.start_point is None, self.tail_length is None, self.n_points is None]):
+            return
+        # Compute spacing between points and rebuild the arc LUT if it changed
+        spacing = float(self.tail_length) / self.n_points
+        if spacing != self._lut_spacing:
+            self._build_arc_lut(spacing)
+        # Walk along the tail in every frame, accumulating the small per-frame point arrays
+        x, y = self.start_point
+        minmax_sign = -1 if self._background == "dark" else 1
+        points_list = []
+        for frame in frames:
+            points = np.empty((self.n_points + 1, 2), dtype=np.int32)
+            _walk(np.ascontiguousarray(frame), x, y, float(self.start_angle),
+                  self._arc_offsets, self._dx_lut, self._dy_lut, self.n_points, self.ksize, minmax_sign, points)
+            points_list.append(points)
+        if not points_list:
+            return np.empty(0)
+        # Compute all tail angles in a single vectorized call
+        points_batch = np.stack(points_list)
+        angles = self.compute_tail_angle(points_batch, self.n_tip_points, self.start_angle)
+        return angles
@@ -31,12 +31,8 @@ start_xy = (155, 180)
 length = 140
 tracker = TailTracker(start_xy, length, 10, start_angle=np.pi / 2)
 
-angles = []
-for i in range(2500):
-    f = v.advance_frame()
-    f = f.T[::-1].copy()
-    angle = tracker.track(f)
-    angles.append(angle)
+frames = (v.advance_frame().T[::-1].copy() for i in range(2500))
+angles = tracker.track_batch(frames)
 
 plt.plot(angles)
 plt.show()